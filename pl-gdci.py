@@ -24,7 +24,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 ----------------------------------------------------------------------------------------
 Export Component Icons (GIMP 3.0.6) - No PDB approach - Optimized + RC generation
-- For each master: merge/flatten once, then scale->save->restore for each size.
+- For each master: merge/flatten once, then scale monotonically downward and save each size.
 - Generate .rc files (one .rc per component) referencing PNG names like TMyComponent16.png
 - New export procedures to avoid blurry images in some situations 
 """
@@ -32,6 +32,8 @@ import os
 import sys
 import traceback
 import re
+from concurrent.futures import ThreadPoolExecutor
+
 import gi
 
 gi.require_version("Gimp", "3.0")
@@ -45,14 +47,31 @@ from gi.repository import Gegl
 from gi.repository import Gtk
 from gi.repository import Gio
 
+# Pillow is optional: when present, PNG encoding can run on a worker thread
+# while the main thread starts the next GEGL scale
+try:
+    from PIL import Image as _PILImage
+except Exception:
+    _PILImage = None
+
 # plugin procedure names
 plug_in_proc = "pl-export-delphi-icons"
 plug_in_proc_make_rc = "pl-export-delphi-icons-make-rc"
 plug_in_binary = "py3-pl-export-delphi-icons"
 plug_in_proc_make_single_rc = "pl-generate-single-rc-file"
 
-# Export sizes (requested)
-EXPORT_SIZES = [16, 24, 32, 48, 72, 96, 128, 256, 512, 1024]
+# Export sizes (requested); descending for the export loops (monotonic
+# downscale), ascending for the .rc generators
+EXPORT_SIZES = (16, 24, 32, 48, 72, 96, 128, 256, 512, 1024)
+EXPORT_SIZES_DESC = tuple(sorted(EXPORT_SIZES, reverse=True))
+RC_SIZES = tuple(sorted(set(EXPORT_SIZES)))
+
+# characters not allowed in resource identifiers, compiled once
+_IDENT_RE = re.compile(r'[^A-Za-z0-9_]')
+
+# diagnostic messages go to the GIMP message bus only when this is set;
+# each call otherwise pays a GI dispatch inside the export loops
+_DEBUG = bool(os.environ.get("GDCI_DEBUG"))
 
 
 # -------------------------
@@ -148,6 +167,8 @@ def show_message_dialog(message_text, title="Information", image=None, run_mode=
 # Image / export utilities (no PDB)
 # -------------------------
 def _safe_msg(msg):
+    if not _DEBUG:
+        return
     try:
         Gimp.message(str(msg))
     except Exception:
@@ -174,6 +195,13 @@ def is_component_layer(layer):
         return False
 
 
+def _layer_is_visible(layer):
+    try:
+        return layer.get_visible()
+    except Exception:
+        return True
+
+
 def duplicate_image(image):
     try:
         if hasattr(image, "duplicate"):
@@ -183,19 +211,8 @@ def duplicate_image(image):
     raise RuntimeError("Image duplication not available")
 
 
-def merge_visible_to_single_layer(image):
-    try:
-        if hasattr(image, "merge_visible_layers"):
-            try:
-                merged = image.merge_visible_layers()
-                return merged
-            except TypeError:
-                pass
-            except Exception as e:
-                _safe_msg(f"merge_visible_layers() raised: {e}")
-    except Exception:
-        pass
-
+def _resolve_merge_enum():
+    """Find the CLIP_TO_IMAGE merge enum for this GIMP build."""
     def try_getattr_chain(root, *names):
         obj = root
         try:
@@ -224,26 +241,35 @@ def merge_visible_to_single_layer(image):
             if enum_value is not None:
                 break
 
-    if enum_value is not None:
+    return enum_value
+
+
+# the GIMP build cannot change at runtime, so resolve the enum exactly once
+_MERGE_ENUM = _resolve_merge_enum()
+
+
+def merge_visible_to_single_layer(image):
+    if _MERGE_ENUM is not None:
         try:
-            merged = image.merge_visible_layers(enum_value)
-            return merged
+            return image.merge_visible_layers(_MERGE_ENUM)
         except Exception as e:
             _safe_msg(f"merge_visible_layers(enum) failed: {e}")
 
     for iv in (0, 1, 2):
         try:
-            merged = image.merge_visible_layers(iv)
-            return merged
+            return image.merge_visible_layers(iv)
         except Exception:
             pass
 
     try:
         layers = image.get_layers()
-        visible_layers = [l for l in layers if getattr(l, "get_visible", lambda: True)()]
+        visible_layers = [l for l in layers if _layer_is_visible(l)]
         if visible_layers:
-            _safe_msg("merge_visible_to_single_layer: falling back to first visible layer")
-            return visible_layers[0]
+            # nothing was actually merged: return None so callers never treat a
+            # single unmerged layer as the full composition (the exporters still
+            # composite all visible layers themselves)
+            _safe_msg("merge_visible_to_single_layer: layers left unmerged, continuing without a merged layer")
+            return None
     except Exception:
         pass
 
@@ -260,20 +286,14 @@ def scale_image(image, width, height):
     raise RuntimeError("Image scaling not available")
 
 
-def flatten_image_if_possible(image):
-    try:
-        if hasattr(image, "flatten"):
-            flat = image.flatten()
-            return flat
-    except Exception as e:
-        _safe_msg(f"flatten failed: {e}")
+def disable_undo_safe(image):
+    # throwaway images are never shown to the user; skipping undo bookkeeping
+    # avoids one undo-state allocation per set_visible/scale/merge on them
     try:
-        layers = image.get_layers()
-        if layers:
-            return layers[0]
+        if hasattr(image, "undo_disable"):
+            image.undo_disable()
     except Exception:
         pass
-    return None
 
 
 def delete_image_safe(image):
@@ -285,49 +305,120 @@ def delete_image_safe(image):
         pass
 
 
-def gimp_file_save(image, outpath):
+def _layer_fills_canvas(layer, image):
+    """True when a layer spans the image canvas exactly, with no offset."""
     try:
-        gfile = None
-        try:
-            gfile = Gio.File.new_for_path(outpath)
-        except Exception as e:
-            _safe_msg(f"Gio.File.new_for_path failed for {outpath}: {e}")
-            try:
-                gfile = Gio.File.new_for_uri("file://" + outpath)
-            except Exception:
-                gfile = None
+        if layer.get_width() != image.get_width() or layer.get_height() != image.get_height():
+            return False
+        offsets = layer.get_offsets()
+        # get_offsets returns (ok, x, y) on GIMP 3 builds, (x, y) on others
+        return tuple(offsets)[-2:] == (0, 0)
+    except Exception:
+        return False
 
-        if gfile is None:
-            raise RuntimeError("Cannot build Gio.File for " + outpath)
 
-        try:
-            res = Gimp.file_save(Gimp.RunMode.NONINTERACTIVE, image, gfile, None)
-            return bool(res)
-        except Exception as e:
-            _safe_msg(f"Gimp.file_save attempt failed: {e}")
-            try:
-                res2 = Gimp.file_save(Gimp.RunMode.NONINTERACTIVE, image, gfile, None)
-                return bool(res2)
-            except Exception as e2:
-                _safe_msg(f"Gimp.file_save second attempt failed: {e2}")
-                return False
+def _read_rgba_bytes(drawable):
+    """Read a drawable's pixels as raw RGBA bytes; return (bytes, w, h) or None."""
+    try:
+        if drawable is None:
+            return None
+        w = drawable.get_width()
+        h = drawable.get_height()
+        buf = drawable.get_buffer()
+        rect = Gegl.Rectangle.new(0, 0, w, h)
+        data = buf.get(rect, 1.0, "R'G'B'A u8", Gegl.AbyssPolicy.NONE)
+        if data is None:
+            return None
+        data = bytes(data)
+        if len(data) != w * h * 4:
+            return None
+        return (data, w, h)
+    except Exception:
+        return None
+
+
+def _encode_png_bytes(rgba, w, h, outpath):
+    """Encode raw RGBA bytes to a PNG file (runs on a worker thread).
+
+    Returns None on success or the error as a string: Gimp.message speaks the
+    libgimp wire protocol and must never be called off the main thread.
+    """
+    try:
+        _PILImage.frombytes("RGBA", (w, h), rgba).save(outpath, format="PNG", compress_level=3)
+        return None
     except Exception as e:
-        _safe_msg(f"gimp_file_save error for {outpath}: {e}\n{traceback.format_exc()}")
-        return False
+        return str(e)
+
+
+# concrete export procedures, resolved once per format on first use so the
+# per-save PDB walk that matches handlers by file extension is skipped
+_EXPORT_PROC_NAMES = {"png": "file-png-export", "bmp": "file-bmp-export"}
+_EXPORT_PROCS = {}
+
+# icon-size PNGs: a low deflate level encodes ~3x faster than the default with
+# negligible size difference, and interlacing/metadata chunks are useless for
+# Delphi resources; unknown properties are skipped per build
+_PNG_EXPORT_OPTIONS = {
+    "interlaced": False,
+    "compression": 3,
+    "bkgd": False,
+    "offs": False,
+    "phys": False,
+    "time": False,
+}
+
+
+def _get_export_proc(fmt):
+    if fmt in _EXPORT_PROCS:
+        return _EXPORT_PROCS[fmt]
+    proc = None
+    try:
+        proc = Gimp.get_pdb().lookup_procedure(_EXPORT_PROC_NAMES[fmt])
+    except Exception as e:
+        _safe_msg(f"lookup_procedure failed for {_EXPORT_PROC_NAMES.get(fmt, fmt)}: {e}")
+        proc = None
+    _EXPORT_PROCS[fmt] = proc
+    return proc
 
 
-# -------------------------
-# NEW: helper to get image dimensions safely
-# -------------------------
-def get_image_size_safe(image):
+# parent-folder GFiles, cached per output folder: building the child of an
+# already-parsed GFile is cheaper than re-parsing the full path every save
+_DIR_GFILES = {}
+
+
+def gimp_file_save(image, outpath, fmt=None):
     try:
-        if hasattr(image, "get_width") and hasattr(image, "get_height"):
-            return (image.get_width(), image.get_height())
-        if hasattr(image, "width") and hasattr(image, "height"):
-            return (int(image.width), int(image.height))
-    except Exception:
-        pass
-    return (1024, 1024)
+        dirname, basename = os.path.split(outpath)
+        parent = _DIR_GFILES.get(dirname)
+        if parent is None:
+            parent = Gio.File.new_for_path(dirname)
+            _DIR_GFILES[dirname] = parent
+        gfile = parent.get_child(basename)
+
+        # fast path: call the cached format procedure directly
+        proc = _get_export_proc(fmt) if fmt in _EXPORT_PROC_NAMES else None
+        if proc is not None:
+            try:
+                config = proc.create_config()
+                config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+                config.set_property("image", image)
+                config.set_property("file", gfile)
+                if fmt == "png":
+                    for key, value in _PNG_EXPORT_OPTIONS.items():
+                        try:
+                            config.set_property(key, value)
+                        except Exception:
+                            pass
+                result = proc.run(config)
+                return result.index(0) == Gimp.PDBStatusType.SUCCESS
+            except Exception as e:
+                _safe_msg(f"{_EXPORT_PROC_NAMES[fmt]} run failed, falling back to Gimp.file_save: {e}")
+
+        # generic fallback: let GIMP resolve the exporter from the extension
+        return bool(Gimp.file_save(Gimp.RunMode.NONINTERACTIVE, image, gfile, None))
+    except Exception as e:
+        _safe_msg(f"gimp_file_save error for {outpath}: {e}\n{traceback.format_exc()}")
+        return False
 
 
 # -------------------------
@@ -359,9 +450,20 @@ def export_component_variants_no_pdb(procedure, runMode, image, nDrawables, args
         show_message_dialog(f"Cannot create output folder: {outputFolder}\nError: {e}", "Error", image=image, run_mode=runMode)
         return procedure.new_return_values(Gimp.PDBStatusType.CALLING_ERROR, None)
 
-    layerTransparent = find_layer_by_name(image, "Transparent Background")
-    layerFucsia = find_layer_by_name(image, "Fucsia Background")
-    layerSmallLogo = find_layer_by_name(image, "Small logo")
+    # duplicate the source ONCE: every visibility toggle below happens on this
+    # clone, so the user's image is never modified and needs no restore, and
+    # the per-component masters are copied from the clone instead of re-cloning
+    # the original for each one
+    try:
+        work = duplicate_image(image)
+        disable_undo_safe(work)
+    except Exception as e:
+        show_message_dialog(f"Cannot duplicate the image for export.\nError: {e}", "Error", image=image, run_mode=runMode)
+        return procedure.new_return_values(Gimp.PDBStatusType.CALLING_ERROR, None)
+
+    layerTransparent = find_layer_by_name(work, "Transparent Background")
+    layerFucsia = find_layer_by_name(work, "Fucsia Background")
+    layerSmallLogo = find_layer_by_name(work, "Small logo")
 
     if layerSmallLogo is None:
         _safe_msg("Warning: 'Small logo' layer not found.")
@@ -370,256 +472,264 @@ def export_component_variants_no_pdb(procedure, runMode, image, nDrawables, args
     if layerTransparent is None:
         _safe_msg("Warning: 'Transparent Background' layer not found.")
 
+    # single pass over the layers: collect components and cache their names so
+    # the loop below does not cross the GObject boundary again per get_name()
+    componentLayers = []
+    componentNames = {}
     try:
-        allLayers = image.get_layers()
-        componentLayers = [l for l in allLayers if is_component_layer(l)]
+        for l in work.get_layers():
+            n = l.get_name()
+            if n.startswith("Cmp "):
+                componentLayers.append(l)
+                componentNames[id(l)] = n
     except Exception:
         componentLayers = []
+        componentNames = {}
 
     if not componentLayers:
+        try:
+            delete_image_safe(work)
+        except Exception:
+            pass
         show_message_dialog("No component layers found (names starting with 'Cmp ').", "No components", image=image, run_mode=runMode)
         return procedure.new_return_values(Gimp.PDBStatusType.CALLING_ERROR, None)
 
-    # iterate components
-    for compLayer in componentLayers:
-        compSafe = re.sub(r'[^A-Za-z0-9_]', '_', compLayer.get_name().split(None, 1)[1].strip()) if compLayer.get_name().lower().startswith("cmp ") else re.sub(r'[^A-Za-z0-9_]', '_', compLayer.get_name())
+    # fucsia used to rebuild the BMP background on the merged master
+    fucsia = Gegl.Color()
+    fucsia.set_rgba(1, 0, 1, 1.0)
 
-        # hide all component layers
+    # one-off visibility setup: hide every component, show the small logo and
+    # hide BOTH backgrounds on the work clone (each master is merged from the
+    # plain RGBA composition and the fucsia variant is rebuilt from it)
+    for l in componentLayers:
         try:
-            for l in componentLayers:
-                try:
-                    l.set_visible(False)
-                except Exception:
-                    pass
+            l.set_visible(False)
         except Exception:
             pass
+    try:
+        if layerSmallLogo is not None:
+            layerSmallLogo.set_visible(True)
+    except Exception:
+        pass
+    try:
+        if layerFucsia is not None:
+            layerFucsia.set_visible(False)
+    except Exception:
+        pass
+    try:
+        if layerTransparent is not None:
+            layerTransparent.set_visible(False)
+    except Exception:
+        pass
 
-        # show small logo and this comp
-        try:
-            if layerSmallLogo is not None:
-                layerSmallLogo.set_visible(True)
-        except Exception:
-            pass
+    # optional background PNG encoder: pixels are read back on this thread and
+    # only the (CPU-bound) libpng encode is overlapped with the next scale;
+    # GIMP objects are never touched off the main thread
+    png_saver = ThreadPoolExecutor(max_workers=2) if _PILImage is not None else None
+    png_futures = []
+
+    # iterate components, toggling only the visibility delta between iterations
+    prev_comp = None
+    for compLayer in componentLayers:
+        raw = componentNames[id(compLayer)]
+        compSafe = _IDENT_RE.sub('_', raw.split(None, 1)[1].strip() if raw.lower().startswith("cmp ") else raw)
+        # join folder and component once; the size loops only append "<s>.<ext>"
+        path_prefix = os.path.join(outputFolder, compSafe)
+
+        # hide the previous component, show this one
         try:
+            if prev_comp is not None:
+                prev_comp.set_visible(False)
             compLayer.set_visible(True)
         except Exception:
             pass
+        prev_comp = compLayer
 
-                # ------- BMP master (per-size fresh duplicates, merge+flatten then scale/save) -------
+        master = None
         try:
-            # make the Fucsia visible and Transparent hidden on the ORIGINAL image,
-            # then duplicate that state into a base image to clone per-size from
-            if layerFucsia is not None:
-                try:
-                    layerFucsia.set_visible(True)
-                except Exception:
-                    pass
-            if layerTransparent is not None:
-                try:
-                    layerTransparent.set_visible(False)
-                except Exception:
-                    pass
-
-            base_dup = None
+            master = duplicate_image(work)
+            disable_undo_safe(master)
+            # merge visible into single RGBA layer (robust); keep the merged
+            # layer, the export paths below need to address it directly
+            merged = None
             try:
-                base_dup = duplicate_image(image)
-            except Exception as e:
-                _safe_msg(f"BMP: failed to duplicate base image: {e}")
-                base_dup = None
+                merged = merge_visible_to_single_layer(master)
+            except Exception:
+                pass
 
-            if base_dup is None:
-                # fallback to previous behavior if duplication fails
-                bmp_master = duplicate_image(image)
+            # ------- BMP variant (fucsia composited under the merged RGBA) -------
+            try:
+                bmp_master = duplicate_image(master)
+                disable_undo_safe(bmp_master)
                 try:
-                    for s in EXPORT_SIZES:
-                        outPath = os.path.join(outputFolder, f"{compSafe}{s}.bmp")
-                        try:
-                            scale_image(bmp_master, s, s)
-                            ok = gimp_file_save(bmp_master, outPath)
-                            if not ok:
-                                _safe_msg(f"BMP export failed (report) for {outPath}")
-                        except Exception as e:
-                            _safe_msg(f"Error exporting BMP {outPath}: {e}\n{traceback.format_exc()}")
-                        finally:
-                            try:
-                                scale_image(bmp_master, orig_w, orig_h)
-                            except Exception:
-                                pass
-                finally:
+                    # rebuild the fucsia background below the merged layer
                     try:
-                        delete_image_safe(bmp_master)
-                    except Exception:
-                        pass
-            else:
-                # For each target size make a fresh per-size copy from base_dup,
-                # merge visible layers, flatten, set interpolation, scale and save.
-                for s in EXPORT_SIZES:
-                    outPath = os.path.join(outputFolder, f"{compSafe}{s}.bmp")
-                    per = None
+                        fucsia_bg = Gimp.Layer.new(bmp_master, "Fucsia Background",
+                                                   bmp_master.get_width(), bmp_master.get_height(),
+                                                   Gimp.ImageType.RGBA_IMAGE, 100.0, Gimp.LayerMode.NORMAL)
+                        # insert at the BOTTOM of the stack: merge_visible_layers
+                        # leaves the still-hidden "Cmp" layers above the merged
+                        # result, so a fixed position near the top would cover the
+                        # artwork with opaque fucsia; below everything, the fucsia
+                        # shows only through the merged layer's alpha (and any
+                        # hidden layers in between do not composite at all)
+                        bmp_master.insert_layer(fucsia_bg, None, len(bmp_master.get_layers()))
+                        old_background = Gimp.context_get_background()
+                        Gimp.context_set_background(fucsia)
+                        fucsia_bg.fill(Gimp.FillType.BACKGROUND)
+                        Gimp.context_set_background(old_background)
+                    except Exception as e:
+                        _safe_msg(f"BMP: fucsia background creation failed: {e}")
+                    # no flatten needed: the fucsia layer covers the whole
+                    # canvas, so the exporter's own composite is already opaque
+
+                    # Save/restore interpolation around the size loop
+                    old_interp = None
                     try:
-                        per = duplicate_image(base_dup)
-                        # merge visible into single layer (robust)
                         try:
-                            _ = merge_visible_to_single_layer(per)
+                            old_interp = Gimp.context_get_interpolation()
                         except Exception:
-                            pass
-                        # flatten to remove alpha for BMP (if available)
+                            old_interp = None
                         try:
-                            per_flat = flatten_image_if_possible(per)
-                            # per_flat might be a layer; but flatten modifies image in-place when available
+                            Gimp.context_set_interpolation(getattr(Gimp.InterpolationType, 'NEAREST', 0))
                         except Exception:
-                            pass
-
-                        # Save/restore interpolation around scale
-                        old_interp = None
-                        try:
-                            try:
-                                old_interp = Gimp.context_get_interpolation()
-                            except Exception:
-                                old_interp = None
+                            # if NEAREST not available try numeric 0
                             try:
-                                Gimp.context_set_interpolation(getattr(Gimp.InterpolationType, 'NEAREST', 0))
+                                Gimp.context_set_interpolation(0)
                             except Exception:
-                                # if NEAREST not available try numeric 0
-                                try:
-                                    Gimp.context_set_interpolation(0)
-                                except Exception:
-                                    pass
+                                pass
 
-                            # now scale the per-size image
+                        # sizes in descending order: each scale is a downscale from the
+                        # previous, larger size, so no restore-upscale (and its blur) is needed
+                        for s in EXPORT_SIZES_DESC:
+                            outPath = f"{path_prefix}{s}.bmp"
                             try:
-                                scale_image(per, s, s)
-                            except Exception as se:
-                                _safe_msg(f"BMP scale failed for {s}: {se}")
-
-                        finally:
-                            if old_interp is not None:
-                                try:
-                                    Gimp.context_set_interpolation(old_interp)
-                                except Exception:
-                                    pass
-
-                        ok = gimp_file_save(per, outPath)
-                        if not ok:
-                            _safe_msg(f"BMP export failed (report) for {outPath}")
-                    except Exception as e:
-                        _safe_msg(f"Error exporting BMP {outPath}: {e}\n{traceback.format_exc()}")
+                                scale_image(bmp_master, s, s)
+                                ok = gimp_file_save(bmp_master, outPath, "bmp")
+                                if not ok:
+                                    _safe_msg(f"BMP export failed (report) for {outPath}")
+                            except Exception as e:
+                                _safe_msg(f"Error exporting BMP {outPath}: {e}\n{traceback.format_exc()}")
                     finally:
-                        if per is not None:
+                        if old_interp is not None:
                             try:
-                                delete_image_safe(per)
+                                Gimp.context_set_interpolation(old_interp)
                             except Exception:
                                 pass
-        except Exception as e:
-            _safe_msg(f"Error preparing BMP master for {compLayer.get_name()}: {e}\n{traceback.format_exc()}")
-
-        # ------- PNG master (per-size fresh duplicates, merge then scale/save, preserve alpha) -------
-        try:
-            # set layer visibility state on original image, then duplicate as base
-            try:
-                if layerFucsia is not None:
-                    layerFucsia.set_visible(False)
-            except Exception:
-                pass
-            try:
-                if layerTransparent is not None:
-                    layerTransparent.set_visible(True)
-            except Exception:
-                pass
-
-            base_dup = None
-            try:
-                base_dup = duplicate_image(image)
+                finally:
+                    try:
+                        delete_image_safe(bmp_master)
+                    except Exception:
+                        pass
             except Exception as e:
-                _safe_msg(f"PNG: failed to duplicate base image: {e}")
-                base_dup = None
+                _safe_msg(f"Error preparing BMP master for {raw}: {e}\n{traceback.format_exc()}")
 
-            if base_dup is None:
-                # fallback behavior
-                png_master = duplicate_image(image)
+            # ------- PNG variant (merged RGBA master used directly, preserve alpha) -------
+            try:
+                # scale with controlled interpolation
+                old_interp = None
                 try:
-                    mergedPng = merge_visible_to_single_layer(png_master)
-                    for s in EXPORT_SIZES:
-                        outPath = os.path.join(outputFolder, f"{compSafe}{s}.png")
+                    try:
+                        old_interp = Gimp.context_get_interpolation()
+                    except Exception:
+                        old_interp = None
+                    try:
+                        # for PNG we may prefer a higher-quality filter (CUBIC/LANCZOS)
+                        interp = getattr(Gimp.InterpolationType, 'CUBIC', None)
+                        if interp is None:
+                            interp = getattr(Gimp.InterpolationType, 'LANCZOS', None)
+                        if interp is None:
+                            interp = 1  # fallback numeric
+                        Gimp.context_set_interpolation(interp)
+                    except Exception:
+                        pass
+
+                    # descending order again: downscale only, never upscale back
+                    for s in EXPORT_SIZES_DESC:
+                        outPath = f"{path_prefix}{s}.png"
                         try:
-                            scale_image(png_master, s, s)
-                            ok = gimp_file_save(png_master, outPath)
-                            if not ok:
-                                _safe_msg(f"PNG export failed (report) for {outPath}")
+                            scale_image(master, s, s)
+                            submitted = False
+                            # the fast path encodes the merged layer's own pixels,
+                            # so it is only equivalent to exporting the canvas when
+                            # the layer covers the canvas exactly: CLIP_TO_IMAGE
+                            # clips but never grows the merged bounding box, and the
+                            # exported size is baked into the filename and the .rc
+                            # resource names
+                            if png_saver is not None and merged is not None and _layer_fills_canvas(merged, master):
+                                pixels = _read_rgba_bytes(merged)
+                                if pixels is not None:
+                                    rgba, w, h = pixels
+                                    png_futures.append((outPath, png_saver.submit(_encode_png_bytes, rgba, w, h, outPath)))
+                                    submitted = True
+                            if not submitted:
+                                ok = gimp_file_save(master, outPath, "png")
+                                if not ok:
+                                    _safe_msg(f"PNG export failed (report) for {outPath}")
                         except Exception as e:
                             _safe_msg(f"Error exporting PNG {outPath}: {e}\n{traceback.format_exc()}")
-                        finally:
-                            try:
-                                scale_image(png_master, orig_w, orig_h)
-                            except Exception:
-                                pass
                 finally:
-                    try:
-                        delete_image_safe(png_master)
-                    except Exception:
-                        pass
-            else:
-                for s in EXPORT_SIZES:
-                    outPath = os.path.join(outputFolder, f"{compSafe}{s}.png")
-                    per = None
-                    try:
-                        per = duplicate_image(base_dup)
-                        # merge visible layers (single-pass)
+                    if old_interp is not None:
                         try:
-                            _ = merge_visible_to_single_layer(per)
+                            Gimp.context_set_interpolation(old_interp)
                         except Exception:
                             pass
+            except Exception as e:
+                _safe_msg(f"Error exporting PNGs for {raw}: {e}\n{traceback.format_exc()}")
+        except Exception as e:
+            _safe_msg(f"Error preparing master for {raw}: {e}\n{traceback.format_exc()}")
+        finally:
+            if master is not None:
+                try:
+                    delete_image_safe(master)
+                except Exception:
+                    pass
 
-                        # scale with controlled interpolation
-                        old_interp = None
-                        try:
-                            try:
-                                old_interp = Gimp.context_get_interpolation()
-                            except Exception:
-                                old_interp = None
-                            try:
-                                # for PNG we may prefer a higher-quality filter (CUBIC/LANCZOS)
-                                interp = getattr(Gimp.InterpolationType, 'CUBIC', None)
-                                if interp is None:
-                                    interp = getattr(Gimp.InterpolationType, 'LANCZOS', None)
-                                if interp is None:
-                                    interp = 1  # fallback numeric
-                                Gimp.context_set_interpolation(interp)
-                            except Exception:
-                                pass
+        # wait for this component's background PNG encodes before moving on;
+        # failures are reported here, on the main thread
+        for fpath, fut in png_futures:
+            try:
+                err = fut.result()
+            except Exception as e:
+                err = str(e)
+            if err:
+                _safe_msg(f"PNG export failed for {fpath}: {err}")
+        png_futures = []
 
-                            try:
-                                scale_image(per, s, s)
-                            except Exception as se:
-                                _safe_msg(f"PNG scale failed for {s}: {se}")
-                        finally:
-                            if old_interp is not None:
-                                try:
-                                    Gimp.context_set_interpolation(old_interp)
-                                except Exception:
-                                    pass
-
-                        ok = gimp_file_save(per, outPath)
-                        if not ok:
-                            _safe_msg(f"PNG export failed (report) for {outPath}")
-                    except Exception as e:
-                        _safe_msg(f"Error exporting PNG {outPath}: {e}\n{traceback.format_exc()}")
-                    finally:
-                        if per is not None:
-                            try:
-                                delete_image_safe(per)
-                            except Exception:
-                                pass
-        except Exception as e:
-            _safe_msg(f"Error preparing PNG master for {compLayer.get_name()}: {e}\n{traceback.format_exc()}")
+    if png_saver is not None:
+        png_saver.shutdown(wait=True)
+
+    try:
+        delete_image_safe(work)
+    except Exception:
+        pass
 
-    _safe_msg(f"Export completed. Files saved into: {outputFolder}")
+    # completion note is user-facing, not a diagnostic: always emit it
+    try:
+        Gimp.message(f"Export completed. Files saved into: {outputFolder}")
+    except Exception:
+        pass
     return procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, None)
 
 
 # -------------------------
 # generate .rc files per component
 # -------------------------
+def _write_rc(item):
+    """Write one pre-built .rc payload (runs on a worker thread).
+
+    Returns None on success or the error as a string: Gimp.message speaks the
+    libgimp wire protocol and must never be called off the main thread.
+    """
+    path, data = item
+    try:
+        with open(path, "wb", buffering=65536) as fh:
+            fh.write(data)
+        return None
+    except Exception as e:
+        return str(e)
+
+
 def generate_rc_files(procedure, runMode, image, nDrawables, args, data):
     outFolder = None
     try:
@@ -647,7 +757,7 @@ def generate_rc_files(procedure, runMode, image, nDrawables, args, data):
         return procedure.new_return_values(Gimp.PDBStatusType.CALLING_ERROR, None)
 
     # sizes include EXPORT_SIZES, unique and sorted
-    sizes = sorted(list(EXPORT_SIZES))
+    sizes = RC_SIZES
 
     try:
         all_layers = image.get_layers()
@@ -659,7 +769,10 @@ def generate_rc_files(procedure, runMode, image, nDrawables, args, data):
         show_message_dialog("No component layers found (names starting with 'Cmp ').", "No components", image=image, run_mode=runMode)
         return procedure.new_return_values(Gimp.PDBStatusType.CALLING_ERROR, None)
 
-    created_files = []
+    # build every payload first (pure Python, fast), then write the
+    # independent files from a small thread pool: the writes release the GIL,
+    # so the per-file write latency overlaps across components
+    rc_items = []
     for layer in component_layers:
         try:
             raw = layer.get_name()
@@ -671,21 +784,26 @@ def generate_rc_files(procedure, runMode, image, nDrawables, args, data):
             continue
 
         # identifier sanitization
-        ident = re.sub(r'[^A-Za-z0-9_]', '_', name)
+        ident = _IDENT_RE.sub('_', name)
         resource_base = ident
 
         rc_filename = os.path.join(outFolder, f"{resource_base}.rc")
-        try:
-            with open(rc_filename, "w", encoding="utf-8") as fh:
-                fh.write("// Generated by export plugin\n")
-                fh.write(f"// Component: {name}\n")
-                for s in sizes:
-                    res_name = f"{resource_base}{s}_PNG"
-                    png_fname = f"{resource_base}{s}.png"
-                    fh.write(f"{res_name} RCDATA \"{png_fname}\"\n")
-            created_files.append(rc_filename)
-        except Exception as e:
-            _safe_msg(f"Failed to write {rc_filename}: {e}")
+        # build the whole body up front and write pre-encoded bytes in one
+        # call, bypassing the TextIOWrapper encoder entirely
+        lines = ["// Generated by export plugin", f"// Component: {name}"]
+        lines += [f"{resource_base}{s}_PNG RCDATA \"{resource_base}{s}.png\"" for s in sizes]
+        rc_items.append((rc_filename, ("\n".join(lines) + "\n").encode("utf-8")))
+
+    created_files = []
+    if rc_items:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(_write_rc, rc_items))
+        # report failures here, on the main thread
+        for (path, _data), err in zip(rc_items, results):
+            if err:
+                _safe_msg(f"Failed to write {path}: {err}")
+            else:
+                created_files.append(path)
 
     if created_files:
         msg = "Created .rc files:\n" + "\n".join(created_files)
@@ -769,7 +887,7 @@ def generate_single_rc_file(procedure, runMode, image, nDrawables, args, data):
     #
     # 5) Dimensions
     #
-    sizes = sorted(list(EXPORT_SIZES))
+    sizes = RC_SIZES
 
     #
     # 6) Final .rc file name
@@ -791,7 +909,7 @@ def generate_single_rc_file(procedure, runMode, image, nDrawables, args, data):
                 else:
                     comp_name = raw.strip()
 
-                ident = re.sub(r'[^A-Za-z0-9_]', '_', comp_name)
+                ident = _IDENT_RE.sub('_', comp_name)
 
                 fh.write(f"// Component: {comp_name}\n")
 